@@ -1,13 +1,33 @@
+import heapq
 import json
 import os
-import time
 import re
 import uuid as uuid_lib
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import itemgetter
 from typing import Dict, List, Optional, Tuple
 
 from mcdreforged.api.all import *
 
+# 优先使用orjson加速JSON解析，未安装时回退到标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+    
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+else:
+    _loads = json.loads
+    
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=4, ensure_ascii=False).encode('utf-8')
+
 PLUGIN_METADATA = {
     'id': 'mining_placement_stats',
     'version': '1.0.0',
@@ -33,12 +53,41 @@ DEFAULT_CONFIG = {
 }
 
 # 全局数据结构
-mining_stats = {}               # 挖掘统计数据 {玩家名: 总数量}
-placement_stats = {}            # 放置统计数据 {玩家名: 总数量}
+mining_stats = {}               # 挖掘统计数据 {小写玩家名: 总数量}
+placement_stats = {}            # 放置统计数据 {小写玩家名: 总数量}
 config = DEFAULT_CONFIG.copy()  # 当前配置
-update_thread = None            # 更新线程引用
+update_timer = None             # 更新定时器引用
+_timer_lock = threading.Lock()  # 保护定时器的重新安排与取消
+_stop_event = threading.Event() # 停止信号，设置后不再安排新的更新
 SCOREBOARD_NAME = 'stats_sidebar'  # 计分板名称
 whitelist_players = set()       # 白名单玩家集合
+whitelist_lower = {}            # 白名单小写索引 {小写玩家名: 白名单中的玩家名}，同时用作显示名称映射
+_usercache_by_uuid = {}         # usercache缓存 {无横线小写UUID: 玩家名}
+_usercache_mtime = None         # usercache文件修改时间，用于判断缓存是否失效
+_file_cache = {}                # 统计文件解析缓存 {UUID: (修改时间ns, 文件大小, 挖掘数, 放置数)}
+_last_saved_hash = None         # 上次保存时数据的哈希值，数据未变化时跳过写入
+
+# 服务器相关路径，在插件加载时解析一次
+_SERVER_DIR = ''                # 服务器工作目录
+_STATS_DIRS = []                # 玩家统计文件目录候选列表
+_DEBUG_STATS_DIRS = []          # 调试命令中检查的统计文件目录
+_USERCACHE_PATHS = []           # usercache.json候选路径
+_WHITELIST_PATH = ''            # 白名单文件路径
+
+# 物品和工具的关键词列表（不计入放置统计）
+NON_BLOCK_ITEMS = [
+    'sword', 'axe', 'pickaxe', 'shovel', 'hoe', 'bow', 'shield', 
+    'helmet', 'chestplate', 'leggings', 'boots', 'potion', 
+    'splash_potion', 'lingering_potion', 'experience_bottle',
+    'fishing_rod', 'flint_and_steel', 'shears', 'lead', 'name_tag',
+    'minecart', 'boat', 'saddle', 'horse_armor', 'elytra',
+    'trident', 'crossbow', 'book', 'map', 'compass', 'clock',
+    'spyglass', 'totem', 'apple', 'beef', 'chicken', 'cod',
+    'salmon', 'potato', 'carrot', 'bread', 'cookie', 'melon',
+    'egg', 'milk', 'mushroom', 'rabbit', 'mutton', 'porkchop'
+]
+# 预编译为单个正则，一次扫描即可判断是否包含任一关键词
+_NON_BLOCK_RE = re.compile('|'.join(map(re.escape, NON_BLOCK_ITEMS))).search
 
 def load_config(server: PluginServerInterface):
     """
@@ -68,54 +117,94 @@ def load_stats(server: PluginServerInterface):
     加载玩家统计数据
     如果数据文件不存在则创建空数据
     """
-    global mining_stats, placement_stats
+    global mining_stats, placement_stats, _file_cache, _last_saved_hash
     if os.path.exists(STATS_FILE):
-        with open(STATS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            mining_stats = data.get('mining', {})
-            placement_stats = data.get('placement', {})
+        with open(STATS_FILE, 'rb') as f:
+            data = _loads(f.read())
+            # 兼容旧数据文件，统一转为小写玩家名作为键
+            mining_stats = {name.lower(): count for name, count in data.get('mining', {}).items()}
+            placement_stats = {name.lower(): count for name, count in data.get('placement', {}).items()}
+            _file_cache = {uuid: tuple(value) for uuid, value in data.get('file_cache', {}).items()}
+        _last_saved_hash = _stats_hash()
         server.logger.info(f'已加载统计数据: 挖掘数据{len(mining_stats)}条, 放置数据{len(placement_stats)}条')
     else:
         server.logger.info('未找到现有统计数据文件，将创建新文件')
         save_stats(server)
 
+def _stats_hash() -> int:
+    """
+    计算当前统计数据的哈希值，用于判断数据是否有变化
+    """
+    return hash((
+        tuple(sorted(mining_stats.items())),
+        tuple(sorted(placement_stats.items())),
+        tuple(sorted((uuid, tuple(value)) for uuid, value in _file_cache.items()))
+    ))
+
 def save_stats(server: PluginServerInterface):
     """
     保存统计数据到文件
-    确保配置目录存在
+    数据自上次保存后未变化时跳过写入
+    先写入临时文件再替换，避免写入中断导致文件损坏
     """
+    global _last_saved_hash
+    h = _stats_hash()
+    if h == _last_saved_hash:
+        return
+    
     if not os.path.exists('config'):
         os.makedirs('config')
-    with open(STATS_FILE, 'w', encoding='utf-8') as f:
-        json.dump({
+    tmp_file = STATS_FILE + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(_dumps({
             'mining': mining_stats,
-            'placement': placement_stats
-        }, f, indent=4, ensure_ascii=False)
+            'placement': placement_stats,
+            'file_cache': _file_cache
+        }))
+    os.replace(tmp_file, STATS_FILE)
+    _last_saved_hash = h
+
+def init_paths():
+    """
+    解析并缓存服务器相关文件路径
+    避免每次调用时重复计算工作目录和拼接路径
+    """
+    global _SERVER_DIR, _STATS_DIRS, _DEBUG_STATS_DIRS, _USERCACHE_PATHS, _WHITELIST_PATH
+    _SERVER_DIR = os.path.abspath('.')
+    _STATS_DIRS = [
+        os.path.join(_SERVER_DIR, 'server', 'world', 'stats'),
+    ]
+    _DEBUG_STATS_DIRS = [
+        os.path.join(_SERVER_DIR, 'world', 'stats'),
+        os.path.join(_SERVER_DIR, 'stats'),
+    ]
+    _USERCACHE_PATHS = [
+        os.path.join(_SERVER_DIR, 'usercache.json'),
+        os.path.join(_SERVER_DIR, 'server', 'usercache.json')
+    ]
+    _WHITELIST_PATH = os.path.join(_SERVER_DIR, 'server', 'whitelist.json')
 
 def load_whitelist(server: PluginServerInterface):
     """
     从服务器加载白名单玩家列表
     白名单用于过滤排行榜中显示的玩家
     """
-    global whitelist_players
+    global whitelist_players, whitelist_lower
     whitelist_players = set()
-    
-    # 获取当前工作目录
-    current_dir = os.path.abspath('.')
-    
-    # 使用标准位置
-    whitelist_path = os.path.join(current_dir, 'server', 'whitelist.json')
+    whitelist_lower = {}
+    whitelist_path = _WHITELIST_PATH
     
     server.logger.info(f'使用白名单路径: {whitelist_path}')
     
     if os.path.exists(whitelist_path):
         try:
-            with open(whitelist_path, 'r', encoding='utf-8') as f:
-                whitelist = json.load(f)
+            with open(whitelist_path, 'rb') as f:
+                whitelist = _loads(f.read())
                 for entry in whitelist:
                     name = entry.get('name')
                     if name:
                         whitelist_players.add(name)
+            whitelist_lower = {name.lower(): name for name in whitelist_players}
             server.logger.info(f'成功加载白名单玩家: {len(whitelist_players)}人')
             server.logger.info(f'白名单玩家列表: {", ".join(whitelist_players)}')
         except Exception as e:
@@ -128,7 +217,7 @@ def on_load(server: PluginServerInterface, prev):
     插件加载入口函数
     初始化配置、数据并注册命令
     """
-    global update_thread
+    init_paths()
     load_config(server)
     load_stats(server)
     load_whitelist(server)
@@ -141,20 +230,26 @@ def on_load(server: PluginServerInterface, prev):
 def schedule_update_task(server: PluginServerInterface):
     """
     安排定时更新任务
-    创建后台线程定期更新统计数据
+    使用定时器定期更新统计数据，每次执行后重新安排下一次
     """
-    global update_thread
-    
-    def update_task():
+    def tick():
         try:
-            while True:
-                time.sleep(config['update_interval'])
-                update_stats_for_all_players(server)
+            update_stats_for_all_players(server)
         except Exception as e:
-            server.logger.error(f"更新线程出错: {e}")
-    
-    update_thread = threading.Thread(target=update_task, daemon=True)
-    update_thread.start()
+            server.logger.error(f"定时更新出错: {e}")
+        arm()
+    
+    def arm():
+        global update_timer
+        with _timer_lock:
+            if _stop_event.is_set():
+                return
+            update_timer = threading.Timer(config['update_interval'], tick)
+            update_timer.daemon = True
+            update_timer.start()
+    
+    _stop_event.clear()
+    arm()
     server.logger.info(f'已启动自动更新任务，每{config["update_interval"]}秒更新一次')
 
 def register_commands(server: PluginServerInterface):
@@ -191,20 +286,15 @@ def debug_command(server: PluginServerInterface, source: CommandSource):
     server.say(f'§7放置数据: {len(placement_stats)}条')
     
     # 显示服务器环境信息
-    server_dir = os.path.abspath('.')
-    server.say(f'§7服务器目录: {server_dir}')
+    server.say(f'§7服务器目录: {_SERVER_DIR}')
     
     # 尝试查找统计文件目录
-    possible_dirs = [
-        os.path.join(server_dir, 'world', 'stats'),
-        os.path.join(server_dir, 'stats'),
-    ]
-    
-    for stats_dir in possible_dirs:
+    for stats_dir in _DEBUG_STATS_DIRS:
         if os.path.exists(stats_dir):
             server.say(f'§a找到统计文件目录: {stats_dir}')
             # 列出几个统计文件示例
-            stats_files = os.listdir(stats_dir)[:5]  # 最多显示5个
+            with os.scandir(stats_dir) as it:
+                stats_files = [entry.name for entry in islice(it, 5)]  # 最多显示5个
             server.say(f'§7统计文件示例: {", ".join(stats_files)}')
         else:
             server.say(f'§c未找到统计文件目录: {stats_dir}')
@@ -219,6 +309,83 @@ def update_command(server: PluginServerInterface, source: CommandSource):
     load_whitelist(server)
     server.say(f'§a数据更新完成！共更新了{updated_count}名玩家的数据')
 
+def _read_file(path: str, size_hint: int) -> bytes:
+    """
+    按已知文件大小一次性读取文件内容
+    直接使用文件描述符读取，省去缓冲文件对象的额外系统调用
+    
+    参数:
+        path: 文件路径
+        size_hint: 预期的文件大小(来自stat结果)
+        
+    返回:
+        文件的全部字节内容
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        # 多读一个字节，读到的长度不超过预期大小即说明已到文件末尾
+        data = os.read(fd, size_hint + 1)
+        if len(data) <= size_hint:
+            return data
+        
+        # 文件在stat之后变大时继续读取剩余部分
+        chunks = [data]
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b''.join(chunks)
+    finally:
+        os.close(fd)
+
+def _process_stats_file(server: PluginServerInterface, entry: os.DirEntry) -> Optional[Tuple[str, int, int]]:
+    """
+    读取单个玩家统计文件并计算挖掘和放置总数
+    在线程池中执行，出错时记录日志并返回None
+    
+    参数:
+        server: 服务器接口
+        entry: 统计文件的目录项
+        
+    返回:
+        (UUID, 挖掘数量, 放置数量) 或None
+    """
+    # 从文件名获取UUID
+    uuid = entry.name.split('.')[0]
+    is_non_block = _NON_BLOCK_RE  # 绑定为局部变量，减少循环内的全局查找
+    
+    try:
+        # 文件修改时间和大小未变化时直接使用缓存结果，跳过解析
+        st = entry.stat()
+        file_key = (st.st_mtime_ns, st.st_size)
+        cached = _file_cache.get(uuid)
+        if cached and tuple(cached[:2]) == file_key:
+            return uuid, cached[2], cached[3]
+        
+        # 读取统计数据
+        stats_data = _loads(_read_file(entry.path, st.st_size))
+        
+        stats = stats_data.get('stats') or {}
+        mined = stats.get('minecraft:mined')
+        used = stats.get('minecraft:used')
+        
+        # 提取挖掘数据
+        mine_count = sum(mined.values()) if mined else 0
+        
+        # 提取放置数据，只要不在排除列表中的物品，都计入放置统计
+        place_count = sum(
+            count for block_id, count in used.items()
+            if ':' in block_id and not is_non_block(block_id)
+        ) if used else 0
+        
+        _file_cache[uuid] = (*file_key, mine_count, place_count)
+        return uuid, mine_count, place_count
+    except Exception as e:
+        server.logger.error(f'处理玩家{uuid}的统计数据时出错: {e}')
+        server.logger.error(f'错误详情: {str(e)}')
+        return None
+
 def update_stats_for_all_players(server: PluginServerInterface) -> int:
     """
     更新所有玩家的统计数据
@@ -227,130 +394,121 @@ def update_stats_for_all_players(server: PluginServerInterface) -> int:
     返回值:
         int: 成功更新的玩家数量
     """
-    server_dir = os.path.abspath('.')
+    global mining_stats, placement_stats
     updated_count = 0
     processed_count = 0
     
-    # 保存更新前的数据用于比较
-    old_mining_stats = dict(mining_stats)  # 使用dict()创建深拷贝
-    old_placement_stats = dict(placement_stats)
+    # 更新前的数据用于比较，更新期间不修改
+    old_mining_stats = mining_stats
+    old_placement_stats = placement_stats
     
-    # 清空当前统计数据
-    mining_stats.clear()
-    placement_stats.clear()
-    
-    stats_dirs = [
-        os.path.join(server_dir, 'server', 'world', 'stats'),
-    ]
+    # 新数据写入局部字典，完成后整体替换，避免读取方看到不完整的数据
+    new_mining_stats = {}
+    new_placement_stats = {}
     
-    for stats_dir in stats_dirs:
+    for stats_dir in _STATS_DIRS:
         if not os.path.exists(stats_dir):
             server.logger.info(f'统计目录不存在: {stats_dir}')
             continue
         
         server.logger.info(f'我的统计目录: {stats_dir}')
         
-        stats_files = os.listdir(stats_dir)
-        server.logger.info(f'找到统计文件: {len(stats_files)}个')
+        # 使用scandir遍历，DirEntry自带完整路径和缓存的文件类型
+        with os.scandir(stats_dir) as it:
+            stats_entries = [entry for entry in it
+                             if entry.name.endswith('.json') and entry.is_file()]
+        server.logger.info(f'找到统计文件: {len(stats_entries)}个')
         
-        for filename in stats_files:
-            if not filename.endswith('.json'):
+        processed_count += len(stats_entries)
+        
+        # 并行读取和解析统计文件，结果在主线程中统一合并
+        max_workers = min(16, (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda entry: _process_stats_file(server, entry), stats_entries))
+        
+        for result in results:
+            if result is None:
                 continue
+            uuid, mine_count, place_count = result
+            
+            # 获取玩家名
+            player_name = get_player_name(server, uuid)
+            if not player_name:
+                # 如果无法获取玩家名，使用UUID前缀
+                player_name = f"Player_{uuid[:8]}"
             
-            processed_count += 1
-            # 从文件名获取UUID
-            uuid = filename.split('.')[0]
+            # 写入时统一转为小写，显示时再映射回白名单中的名称
+            key = player_name.lower()
             
-            try:
-                # 读取统计数据
-                file_path = os.path.join(stats_dir, filename)
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    stats_data = json.load(f)
-                
-                # 提取挖掘数据
-                mine_count = 0
-                if 'stats' in stats_data and 'minecraft:mined' in stats_data['stats']:
-                    for _, count in stats_data['stats']['minecraft:mined'].items():
-                        mine_count += count
-                
-                # 提取放置数据
-                place_count = 0
-                if 'stats' in stats_data and 'minecraft:used' in stats_data['stats']:
-                    # 物品和工具的关键词列表（不计入放置统计）
-                    non_block_items = [
-                        'sword', 'axe', 'pickaxe', 'shovel', 'hoe', 'bow', 'shield', 
-                        'helmet', 'chestplate', 'leggings', 'boots', 'potion', 
-                        'splash_potion', 'lingering_potion', 'experience_bottle',
-                        'fishing_rod', 'flint_and_steel', 'shears', 'lead', 'name_tag',
-                        'minecart', 'boat', 'saddle', 'horse_armor', 'elytra',
-                        'trident', 'crossbow', 'book', 'map', 'compass', 'clock',
-                        'spyglass', 'totem', 'apple', 'beef', 'chicken', 'cod',
-                        'salmon', 'potato', 'carrot', 'bread', 'cookie', 'melon',
-                        'egg', 'milk', 'mushroom', 'rabbit', 'mutton', 'porkchop'
-                    ]
-                    
-                    for block_id, count in stats_data['stats']['minecraft:used'].items():
-                        # 只要不在排除列表中的物品，都计入放置统计
-                        if ':' in block_id and not any(item in block_id for item in non_block_items):
-                            place_count += count
-                
-                # 获取玩家名
-                player_name = get_player_name(server, uuid)
-                if not player_name:
-                    # 如果无法获取玩家名，使用UUID前缀
-                    player_name = f"Player_{uuid[:8]}"
-                
-                # 记录数据变化情况
-                old_mine = old_mining_stats.get(player_name, -1)  # -1表示新玩家
-                old_place = old_placement_stats.get(player_name, -1)
-                
-                # 存储新数据
-                mining_stats[player_name] = mine_count
-                placement_stats[player_name] = place_count
-                
-                # 比较数据变化
-                if old_mine != mine_count or old_place != place_count:
-                    server.logger.info(f'玩家 {player_name} 数据已更新: 挖掘 {old_mine} -> {mine_count}, 放置 {old_place} -> {place_count}')
-                    updated_count += 1
-                
-            except Exception as e:
-                server.logger.error(f'处理玩家{uuid}的统计数据时出错: {e}')
-                server.logger.error(f'错误详情: {str(e)}')
+            # 记录数据变化情况
+            old_mine = old_mining_stats.get(key, -1)  # -1表示新玩家
+            old_place = old_placement_stats.get(key, -1)
+            
+            # 存储新数据
+            new_mining_stats[key] = mine_count
+            new_placement_stats[key] = place_count
+            
+            # 比较数据变化
+            if old_mine != mine_count or old_place != place_count:
+                server.logger.info(f'玩家 {player_name} 数据已更新: 挖掘 {old_mine} -> {mine_count}, 放置 {old_place} -> {place_count}')
+                updated_count += 1
         
         # 如果已经处理了统计文件，就不再继续查找
         if processed_count > 0:
             break
     
+    mining_stats, placement_stats = new_mining_stats, new_placement_stats
+    
     # 数据统计信息
     server.logger.info(f'数据汇总: 旧数据 {len(old_mining_stats)}条, 新数据 {len(mining_stats)}条')
     
-    # 检查白名单玩家是否存在于统计数据中
-    found_in_mining = []
-    found_in_placement = []
-    
-    for player in whitelist_players:
-        player_lower = player.lower()
+    # 检查白名单玩家是否存在于统计数据中（仅调试模式）
+    if config.get('debug', False):
+        found_in_mining = whitelist_lower.keys() & mining_stats.keys()
+        found_in_placement = whitelist_lower.keys() & placement_stats.keys()
         
-        # 检查挖掘数据
-        for stat_player in mining_stats.keys():
-            if stat_player.lower() == player_lower:
-                found_in_mining.append(player)
-                break
-                
-        # 检查放置数据
-        for stat_player in placement_stats.keys():
-            if stat_player.lower() == player_lower:
-                found_in_placement.append(player)
-                break
-    
-    server.logger.info(f'白名单玩家在挖掘数据中找到: {len(found_in_mining)}/{len(whitelist_players)}')
-    server.logger.info(f'白名单玩家在放置数据中找到: {len(found_in_placement)}/{len(whitelist_players)}')
+        server.logger.info(f'白名单玩家在挖掘数据中找到: {len(found_in_mining)}/{len(whitelist_players)}')
+        server.logger.info(f'白名单玩家在放置数据中找到: {len(found_in_placement)}/{len(whitelist_players)}')
     
     # 保存更新后的统计数据
     save_stats(server)
     server.logger.info(f'统计更新: 处理了{processed_count}个文件, 数据有变化的玩家{updated_count}名')
     return updated_count
 
+def _load_usercache() -> Dict[str, str]:
+    """
+    加载usercache.json并构建UUID到玩家名的索引
+    仅在文件修改时间变化时重新解析，否则直接返回缓存
+    
+    返回:
+        {无横线小写UUID: 玩家名}
+    """
+    global _usercache_by_uuid, _usercache_mtime
+    usercache_paths = _USERCACHE_PATHS
+    
+    mtimes = tuple(
+        os.path.getmtime(path) if os.path.exists(path) else None
+        for path in usercache_paths
+    )
+    if mtimes == _usercache_mtime:
+        return _usercache_by_uuid
+    
+    by_uuid = {}
+    # 倒序读取，使靠前路径中的条目优先
+    for usercache_path, mtime in reversed(list(zip(usercache_paths, mtimes))):
+        if mtime is None:
+            continue
+        with open(usercache_path, 'rb') as f:
+            usercache = _loads(f.read())
+        for entry in usercache:
+            name = entry.get('name')
+            if name:
+                by_uuid[entry.get('uuid', '').replace('-', '').lower()] = name
+    
+    _usercache_by_uuid = by_uuid
+    _usercache_mtime = mtimes
+    return _usercache_by_uuid
+
 def get_player_name(server: PluginServerInterface, uuid: str) -> Optional[str]:
     """
     尝试从UUID获取玩家名称
@@ -367,34 +525,20 @@ def get_player_name(server: PluginServerInterface, uuid: str) -> Optional[str]:
         # 规范化UUID格式
         clean_uuid = uuid.replace('-', '').lower()
         
-        # 尝试从UUID缓存文件读取
-        usercache_paths = [
-            os.path.join(os.path.abspath('.'), 'usercache.json'),
-            os.path.join(os.path.abspath('.'), 'server', 'usercache.json')
-        ]
-        
-        for usercache_path in usercache_paths:
-            if os.path.exists(usercache_path):
-                with open(usercache_path, 'r', encoding='utf-8') as f:
-                    usercache = json.load(f)
-                    for entry in usercache:
-                        entry_uuid = entry.get('uuid', '').replace('-', '').lower()
-                        if entry_uuid == clean_uuid:
-                            # 检查玩家是否在白名单中
-                            name = entry.get('name')
-                            if name:
-                                # 尝试精确匹配
-                                if name in whitelist_players:
-                                    return name
-                                
-                                # 尝试不区分大小写匹配
-                                name_lower = name.lower()
-                                for whitelist_name in whitelist_players:
-                                    if whitelist_name.lower() == name_lower:
-                                        server.logger.info(f'UUID {uuid} 玩家名称匹配: {name} -> {whitelist_name}')
-                                        return whitelist_name  # 返回白名单中的精确名称
-                                
-                                return name  # 返回原始名称
+        # 从UUID缓存中查找
+        name = _load_usercache().get(clean_uuid)
+        if name:
+            # 尝试精确匹配
+            if name in whitelist_players:
+                return name
+            
+            # 尝试不区分大小写匹配
+            whitelist_name = whitelist_lower.get(name.lower())
+            if whitelist_name:
+                server.logger.info(f'UUID {uuid} 玩家名称匹配: {name} -> {whitelist_name}')
+                return whitelist_name  # 返回白名单中的精确名称
+            
+            return name  # 返回原始名称
         
         # 如果都失败了，直接使用UUID的一部分作为临时名称
         return f"Player_{uuid[:8]}"
@@ -412,32 +556,23 @@ def show_mining_stats(server: PluginServerInterface, source: CommandSource):
     server.logger.info(f'白名单玩家: {", ".join(whitelist_players)}')
     server.logger.info(f'统计玩家: {", ".join(mining_stats.keys())}')
     
-    # 过滤数据，使用更宽松的匹配规则
-    filtered_stats = {}
-    for player_name, count in mining_stats.items():
-        # 尝试精确匹配
-        if player_name in whitelist_players:
-            filtered_stats[player_name] = count
-            continue
-            
-        # 尝试不区分大小写匹配
-        player_lower = player_name.lower()
-        for whitelist_name in whitelist_players:
-            if whitelist_name.lower() == player_lower:
-                filtered_stats[whitelist_name] = count  # 使用白名单中的名称
-                server.logger.info(f'挖掘数据: 通过不区分大小写匹配到玩家 {player_name} -> {whitelist_name}')
-                break
+    # 过滤数据，统计数据以小写玩家名为键，直接映射为白名单中的名称
+    filtered_stats = {whitelist_lower[name]: count for name, count in mining_stats.items() if name in whitelist_lower}
     
     if not filtered_stats:
         server.say('§c没有白名单玩家的挖掘数据')
         return
     
-    sorted_data = sorted(filtered_stats.items(), key=lambda x: x[1], reverse=True)
-    server.say(f'§6§l===== 挖掘榜 - 前{min(config["top_count"], len(sorted_data))}名 =====')
+    # 只需前N名，使用部分排序代替完整排序
+    sorted_data = heapq.nlargest(config['top_count'], filtered_stats.items(), key=itemgetter(1))
+    lines = [f'§6§l===== 挖掘榜 - 前{min(config["top_count"], len(filtered_stats))}名 =====']
     
-    for i, (name, count) in enumerate(sorted_data[:config['top_count']]):
+    for i, (name, count) in enumerate(sorted_data):
         rank_color = '§e' if i < 3 else '§f'  # 前三名用金色
-        server.say(f'{rank_color}{i+1}. {name} - {count} 方块')
+        lines.append(f'{rank_color}{i+1}. {name} - {count} 方块')
+    
+    # 合并为一条多行消息发送，减少消息数量
+    server.say('\n'.join(lines))
 
 def show_placement_stats(server: PluginServerInterface, source: CommandSource):
     """
@@ -447,32 +582,23 @@ def show_placement_stats(server: PluginServerInterface, source: CommandSource):
     # 记录调试信息
     server.logger.info(f'白名单玩家: {len(whitelist_players)}人, 放置数据: {len(placement_stats)}条')
     
-    # 过滤数据，使用更宽松的匹配规则
-    filtered_stats = {}
-    for player_name, count in placement_stats.items():
-        # 尝试精确匹配
-        if player_name in whitelist_players:
-            filtered_stats[player_name] = count
-            continue
-            
-        # 尝试不区分大小写匹配
-        player_lower = player_name.lower()
-        for whitelist_name in whitelist_players:
-            if whitelist_name.lower() == player_lower:
-                filtered_stats[whitelist_name] = count  # 使用白名单中的名称
-                server.logger.info(f'放置数据: 通过不区分大小写匹配到玩家 {player_name} -> {whitelist_name}')
-                break
+    # 过滤数据，统计数据以小写玩家名为键，直接映射为白名单中的名称
+    filtered_stats = {whitelist_lower[name]: count for name, count in placement_stats.items() if name in whitelist_lower}
     
     if not filtered_stats:
         server.say('§c没有白名单玩家的放置数据')
         return
     
-    sorted_data = sorted(filtered_stats.items(), key=lambda x: x[1], reverse=True)
-    server.say(f'§6§l===== 放置榜 - 前{min(config["top_count"], len(sorted_data))}名 =====')
+    # 只需前N名，使用部分排序代替完整排序
+    sorted_data = heapq.nlargest(config['top_count'], filtered_stats.items(), key=itemgetter(1))
+    lines = [f'§6§l===== 放置榜 - 前{min(config["top_count"], len(filtered_stats))}名 =====']
     
-    for i, (name, count) in enumerate(sorted_data[:config['top_count']]):
+    for i, (name, count) in enumerate(sorted_data):
         rank_color = '§e' if i < 3 else '§f'  # 前三名用金色
-        server.say(f'{rank_color}{i+1}. {name} - {count} 方块')
+        lines.append(f'{rank_color}{i+1}. {name} - {count} 方块')
+    
+    # 合并为一条多行消息发送，减少消息数量
+    server.say('\n'.join(lines))
 
 def show_help(source: CommandSource):
     """
@@ -493,7 +619,16 @@ def on_unload(server: PluginServerInterface):
     插件卸载函数
     清理资源并保存数据
     """
-    global update_thread
+    global update_timer
+    
+    # 先取消定时器，避免卸载后仍有更新写入数据
+    with _timer_lock:
+        _stop_event.set()
+        timer = update_timer
+        update_timer = None
+    if timer is not None:
+        timer.cancel()
+        timer.join(timeout=5)  # 等待正在进行的更新完成
     
     # 保存数据
     save_stats(server)
@@ -506,7 +641,4 @@ def on_unload(server: PluginServerInterface):
     except Exception as e:
         server.logger.error(f'清理计分板时出错: {e}')
     
-    # 结束线程
-    update_thread = None
-    
     server.logger.info('插件已完全卸载并清理资源') 
\ No newline at end of file